@@ -1,12 +1,12 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import numpy as np
-import plotly.graph_objects as go
 import os
-from groq import Groq
 from dotenv import load_dotenv
 
+# Heavy dependencies (yfinance, plotly, groq) are imported where first needed
+# so the initial page render doesn't pay for them.
+
 # Load API key securely
 load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -15,6 +15,64 @@ if not GROQ_API_KEY:
     st.error("🚨 API Key is missing! Set it in Streamlit Secrets or a .env file.")
     st.stop()
 
+# Cached data fetchers (keyed on ticker so reruns skip the Yahoo round-trip)
+@st.cache_resource(ttl=3600)
+def get_ticker(sym):
+    import yfinance as yf
+    return yf.Ticker(sym)
+
+@st.cache_data(ttl=3600)
+def get_financials(sym):
+    financials = get_ticker(sym).financials
+    return financials if financials is not None else pd.DataFrame()
+
+@st.cache_data(ttl=3600)
+def get_cashflow(sym):
+    cash_flow = get_ticker(sym).cashflow
+    return cash_flow if cash_flow is not None else pd.DataFrame()
+
+@st.cache_data(ttl=3600)
+def get_info(sym):
+    return get_ticker(sym).info
+
+@st.cache_data
+def run_dcf(free_cash_flow, growth_rate, discount_rate, terminal_growth_rate, projection_years, shares_outstanding):
+    t = np.arange(1, projection_years + 1)
+    fcf_proj = free_cash_flow * (1 + growth_rate) ** t
+    cash_flows = fcf_proj / (1 + discount_rate) ** t
+
+    # Terminal value
+    terminal_value = (fcf_proj[-1] * (1 + terminal_growth_rate)) / (discount_rate - terminal_growth_rate)
+    discounted_terminal_value = terminal_value / ((1 + discount_rate) ** projection_years)
+
+    total_enterprise_value = float(cash_flows.sum()) + discounted_terminal_value
+    intrinsic_value_per_share = total_enterprise_value / shares_outstanding
+    return cash_flows, discounted_terminal_value, total_enterprise_value, intrinsic_value_per_share
+
+@st.cache_resource
+def groq_client():
+    from groq import Groq
+    return Groq(api_key=GROQ_API_KEY)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def ai_insights(ticker, growth_rate, discount_rate, terminal_growth_rate,
+                enterprise_value, intrinsic_value, current_price):
+    client = groq_client()
+    response = client.chat.completions.create(
+        messages=[
+            {"role": "system", "content": "You are an AI financial analyst providing insights on DCF models."},
+            {"role": "user", "content": f"Here is the DCF summary for {ticker}:\n"
+                                        f"Revenue Growth Rate: {growth_rate*100:.2f}%\n"
+                                        f"Discount Rate: {discount_rate*100:.2f}%\n"
+                                        f"Terminal Growth Rate: {terminal_growth_rate*100:.2f}%\n"
+                                        f"Enterprise Value: ${enterprise_value:,.2f}\n"
+                                        f"Intrinsic Value/Share: ${intrinsic_value:,.2f}\n"
+                                        f"Current Price: ${current_price}\n"}
+        ],
+        model="openai/gpt-oss-120b",
+    )
+    return response.choices[0].message.content
+
 # Streamlit App UI
 st.set_page_config(page_title="DCF Valuation AI", page_icon="📊", layout="wide")
 st.title("📊 DCF Valuation AI – Discounted Cash Flow Model")
@@ -25,11 +83,9 @@ company_name = st.text_input("🔍 Enter a Stock Ticker:", "AAPL")  # Default: A
 
 if st.button("🚀 Generate DCF Model"):
     try:
-        stock = yf.Ticker(company_name)
-
         # Try fetching data
-        financials = stock.financials if stock.financials is not None else pd.DataFrame()
-        cash_flow = stock.cashflow if stock.cashflow is not None else pd.DataFrame()
+        financials = get_financials(company_name)
+        cash_flow = get_cashflow(company_name)
 
         # Extract financials safely
         revenue = financials.loc["Total Revenue"].values[0] if "Total Revenue" in financials.index else np.nan
@@ -53,8 +109,9 @@ if st.button("🚀 Generate DCF Model"):
         else:
             free_cash_flow = operating_cash_flow - capex
 
-        shares_outstanding = stock.info.get("sharesOutstanding", 1e9)  # fallback 1B shares
-        current_price = stock.info.get("currentPrice", np.nan)
+        info = get_info(company_name)
+        shares_outstanding = info.get("sharesOutstanding", 1e9)  # fallback 1B shares
+        current_price = info.get("currentPrice", np.nan)
 
         # **User Input for DCF Assumptions**
         st.sidebar.header("📊 DCF Assumptions")
@@ -64,19 +121,9 @@ if st.button("🚀 Generate DCF Model"):
         projection_years = st.sidebar.slider("Projection Period (Years)", 1, 10, 5)
 
         # **DCF Projection**
-        cash_flows = []
-        fcf = free_cash_flow
-        for i in range(projection_years):
-            fcf *= (1 + growth_rate)
-            discounted_cash_flow = fcf / ((1 + discount_rate) ** (i + 1))
-            cash_flows.append(discounted_cash_flow)
-
-        # Terminal value
-        terminal_value = (fcf * (1 + terminal_growth_rate)) / (discount_rate - terminal_growth_rate)
-        discounted_terminal_value = terminal_value / ((1 + discount_rate) ** projection_years)
-
-        total_enterprise_value = sum(cash_flows) + discounted_terminal_value
-        intrinsic_value_per_share = total_enterprise_value / shares_outstanding
+        cash_flows, discounted_terminal_value, total_enterprise_value, intrinsic_value_per_share = run_dcf(
+            free_cash_flow, growth_rate, discount_rate, terminal_growth_rate, projection_years, shares_outstanding
+        )
 
         # **Display DCF Results**
         st.subheader("📊 DCF Valuation Results")
@@ -92,6 +139,7 @@ if st.button("🚀 Generate DCF Model"):
 
         # **Plot DCF Cash Flows**
         st.subheader("📈 Projected Free Cash Flows")
+        import plotly.graph_objects as go
         years = list(range(1, projection_years + 1))
         fig_dcf = go.Figure()
         fig_dcf.add_trace(go.Bar(x=years, y=cash_flows, name="Discounted Cash Flow", marker_color="blue"))
@@ -101,21 +149,11 @@ if st.button("🚀 Generate DCF Model"):
 
         # **AI Insights**
         st.subheader("🤖 AI-Powered Valuation Insights")
-        client = Groq(api_key=GROQ_API_KEY)
-        response = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": "You are an AI financial analyst providing insights on DCF models."},
-                {"role": "user", "content": f"Here is the DCF summary for {company_name}:\n"
-                                            f"Revenue Growth Rate: {growth_rate*100:.2f}%\n"
-                                            f"Discount Rate: {discount_rate*100:.2f}%\n"
-                                            f"Terminal Growth Rate: {terminal_growth_rate*100:.2f}%\n"
-                                            f"Enterprise Value: ${total_enterprise_value:,.2f}\n"
-                                            f"Intrinsic Value/Share: ${intrinsic_value_per_share:,.2f}\n"
-                                            f"Current Price: ${current_price}\n"}
-            ],
-            model="openai/gpt-oss-120b",
+        insights = ai_insights(
+            company_name, growth_rate, discount_rate, terminal_growth_rate,
+            total_enterprise_value, intrinsic_value_per_share, current_price,
         )
-        st.write(response.choices[0].message.content)
+        st.write(insights)
 
     except Exception as e:
         st.error(f"⚠️ Error fetching financial data: {e}")
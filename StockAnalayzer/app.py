@@ -2,32 +2,53 @@ import streamlit as st
 import yfinance as yf
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import date
+from kernels import move_mean
 
 # App Title
 st.title("📈 Stock Market Visualizer with Buy/Sell Signals & Alerts")
 st.sidebar.title("Options")
 
 # Helper Functions
+@st.cache_resource(ttl=3600)
+def get_ticker(ticker):
+    """Reuse the yfinance Ticker object across reruns."""
+    return yf.Ticker(ticker)
+
+@st.cache_data(ttl=3600)
 def fetch_stock_data(ticker, start_date, end_date):
     """Fetch stock data using yfinance."""
-    stock = yf.Ticker(ticker)
+    stock = get_ticker(ticker)
     return stock.history(start=start_date, end=end_date)
 
+@st.cache_data(ttl=3600)
+def fetch_portfolio_closes(tickers, start_date, end_date):
+    """Fetch close prices for several tickers in one batched yfinance download."""
+    closes = yf.download(tickers, start=start_date, end=end_date,
+                         progress=False, threads=True)['Close']
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(tickers[0])
+    return closes[tickers]
+
 def plot_candlestick_with_signals(data, short_window, long_window):
     """Plot candlestick with Buy/Sell signals based on MA crossover."""
+    import plotly.graph_objects as go
     # Hitung Moving Average sesuai input user
-    data[f"MA{short_window}"] = data['Close'].rolling(window=short_window).mean()
-    data[f"MA{long_window}"] = data['Close'].rolling(window=long_window).mean()
-
-    # Generate Signals
-    data['Signal'] = 0
-    data['Signal'][long_window:] = np.where(
-        data[f"MA{short_window}"][long_window:] > data[f"MA{long_window}"][long_window:], 1, -1
-    )
-    data['Position'] = data['Signal'].diff()
+    close = data['Close'].to_numpy(dtype=np.float64)
+    ma_short = move_mean(close, int(short_window))
+    ma_long = move_mean(close, int(long_window))
+    data[f"MA{short_window}"] = ma_short
+    data[f"MA{long_window}"] = ma_long
+
+    # Generate Signals: 1 where the short MA is above the long MA, as packed int8
+    above = (ma_short > ma_long).view(np.int8)
+
+    # Crossovers: +1 when short MA crosses above long MA, -1 when it crosses below
+    # (ignoring the warm-up bars where the long MA is still filling)
+    cross = np.zeros_like(above)
+    cross[long_window + 1:] = above[long_window + 1:] - above[long_window:-1]
+    buy_idx = np.flatnonzero(cross == 1)
+    sell_idx = np.flatnonzero(cross == -1)
 
     fig = go.Figure()
 
@@ -50,17 +71,15 @@ def plot_candlestick_with_signals(data, short_window, long_window):
                              name=f"MA{long_window}"))
 
     # Buy Signals
-    buy_signals = data[data['Position'] == 2]
     fig.add_trace(go.Scatter(
-        x=buy_signals.index, y=buy_signals['Close'],
+        x=data.index[buy_idx], y=close[buy_idx],
         mode="markers", marker_symbol="triangle-up", marker_color="green",
         marker_size=12, name="Buy Signal"
     ))
 
     # Sell Signals
-    sell_signals = data[data['Position'] == -2]
     fig.add_trace(go.Scatter(
-        x=sell_signals.index, y=sell_signals['Close'],
+        x=data.index[sell_idx], y=close[sell_idx],
         mode="markers", marker_symbol="triangle-down", marker_color="red",
         marker_size=12, name="Sell Signal"
     ))
@@ -74,47 +93,64 @@ def plot_candlestick_with_signals(data, short_window, long_window):
     # 🔔 ALERT OTOMATIS
     # ======================
     if not data.empty:
-        last_position = data['Position'].iloc[-1]
-        last_close = data['Close'].iloc[-1]
-        if last_position == 2:
+        last_position = cross[-1]
+        last_close = close[-1]
+        if last_position == 1:
             st.success(f"🔔 ALERT: BUY signal terdeteksi pada harga {last_close:.2f} ({data.index[-1].date()})")
-        elif last_position == -2:
+        elif last_position == -1:
             st.error(f"🔔 ALERT: SELL signal terdeteksi pada harga {last_close:.2f} ({data.index[-1].date()})")
         else:
             st.info("ℹ️ Tidak ada sinyal baru pada data terbaru.")
 
     # Rekomendasi terakhir
-    if not buy_signals.empty and (sell_signals.empty or buy_signals.index[-1] > sell_signals.index[-1]):
-        st.success(f"✅ Rekomendasi: BUY pada harga {buy_signals['Close'].iloc[-1]:.2f}")
-    elif not sell_signals.empty and (buy_signals.empty or sell_signals.index[-1] > buy_signals.index[-1]):
-        st.error(f"⚠️ Rekomendasi: SELL pada harga {sell_signals['Close'].iloc[-1]:.2f}")
+    if buy_idx.size and (not sell_idx.size or buy_idx[-1] > sell_idx[-1]):
+        st.success(f"✅ Rekomendasi: BUY pada harga {close[buy_idx[-1]]:.2f}")
+    elif sell_idx.size and (not buy_idx.size or sell_idx[-1] > buy_idx[-1]):
+        st.error(f"⚠️ Rekomendasi: SELL pada harga {close[sell_idx[-1]]:.2f}")
     else:
         st.info("ℹ️ Tidak ada rekomendasi kuat saat ini.")
 
+def add_returns(data):
+    """Add daily (%) and cumulative return columns from a single pass over Close."""
+    close = data['Close'].to_numpy(dtype=np.float64)
+    ret = np.empty_like(close)
+    ret[:1] = np.nan
+    ret[1:] = close[1:] / close[:-1] - 1
+    data['Daily Return'] = ret * 100
+    # Compounded daily returns telescope to price relative to the first close
+    data['Cumulative Return'] = close / close[0] - 1
+
 def plot_volume(data):
-    fig = px.bar(data, x=data.index, y='Volume', title="Trading Volume", template="plotly_dark")
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Bar(x=data.index, y=data['Volume'].to_numpy(), name="Volume"))
+    fig.update_layout(title="Trading Volume", xaxis_title="Date", yaxis_title="Volume", template="plotly_dark")
     st.plotly_chart(fig)
 
 def plot_daily_returns(data):
-    data['Daily Return'] = data['Close'].pct_change() * 100
-    fig = px.line(data, x=data.index, y='Daily Return', title="Daily Returns (%)", template="plotly_dark")
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Scattergl(x=data.index, y=data['Daily Return'].to_numpy(), mode='lines'))
+    fig.update_layout(title="Daily Returns (%)", xaxis_title="Date", yaxis_title="Daily Return", template="plotly_dark")
     st.plotly_chart(fig)
 
 def plot_cumulative_returns(data):
-    data['Cumulative Return'] = (1 + data['Close'].pct_change()).cumprod() - 1
-    fig = px.line(data, x=data.index, y='Cumulative Return', title="Cumulative Returns", template="plotly_dark")
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Scattergl(x=data.index, y=data['Cumulative Return'].to_numpy(), mode='lines'))
+    fig.update_layout(title="Cumulative Returns", xaxis_title="Date", yaxis_title="Cumulative Return", template="plotly_dark")
     st.plotly_chart(fig)
 
 def plot_moving_averages(data, windows):
+    import plotly.graph_objects as go
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=data.index, y=data['Close'], mode='lines', name="Close Price"))
+    close = data['Close'].to_numpy(dtype=np.float64)
     for window in windows:
-        data[f"MA{window}"] = data['Close'].rolling(window=window).mean()
+        data[f"MA{window}"] = move_mean(close, int(window))
         fig.add_trace(go.Scatter(x=data.index, y=data[f"MA{window}"], mode='lines', name=f"MA {window}"))
     fig.update_layout(title="Moving Averages", xaxis_title="Date", yaxis_title="Price", template="plotly_dark")
     st.plotly_chart(fig)
 
 def plot_correlation_matrix(data):
+    import plotly.express as px
     corr = data.corr()
     fig = px.imshow(corr, title="Correlation Matrix", template="plotly_dark", 
                     text_auto=True, color_continuous_scale='RdBu_r')
@@ -138,6 +174,9 @@ if not data.empty:
     st.subheader(f"Stock Data for {ticker}")
     st.write(data.tail())
 
+    # Returns are shared by the daily and cumulative charts
+    add_returns(data)
+
     # Candlestick with Buy/Sell Signals & Alerts
     st.subheader("Candlestick Chart with Buy/Sell Signals")
     plot_candlestick_with_signals(data, short_window, long_window)
@@ -167,12 +206,20 @@ if not data.empty:
 st.sidebar.header("Portfolio Analysis")
 portfolio_file = st.sidebar.file_uploader("Upload Portfolio (CSV or Excel)")
 if portfolio_file:
-    portfolio = pd.read_csv(portfolio_file) if portfolio_file.name.endswith("csv") else pd.read_excel(portfolio_file)
-    tickers = portfolio['Ticker'].tolist()
+    # Read every column: the Portfolio Data table shows weights/shares alongside Ticker
+    if portfolio_file.name.endswith("csv"):
+        portfolio = pd.read_csv(portfolio_file, dtype={'Ticker': 'string'})
+    else:
+        portfolio = pd.read_excel(portfolio_file, dtype={'Ticker': 'string'})
+    # yf.download upper-cases symbols for its columns, so normalise before deduping
+    tickers = portfolio['Ticker'].dropna().astype("string").str.strip().str.upper()
+    tickers = tickers[tickers != ""].unique().tolist()
     st.subheader("Portfolio Data")
     st.write(portfolio)
 
-    portfolio_data = {t: fetch_stock_data(t, start_date, end_date)['Close'] for t in tickers}
-    portfolio_df = pd.DataFrame(portfolio_data)
-    st.subheader("Correlation Matrix")
-    plot_correlation_matrix(portfolio_df)
+    if tickers:
+        portfolio_df = fetch_portfolio_closes(tickers, start_date, end_date)
+        st.subheader("Correlation Matrix")
+        plot_correlation_matrix(portfolio_df)
+    else:
+        st.info("ℹ️ No tickers found in the portfolio's 'Ticker' column.")
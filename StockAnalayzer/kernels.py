@@ -0,0 +1,31 @@
+import numpy as np
+from numba import njit, types
+
+# Read-only input type: pandas >= 3 hands out read-only views from Series.to_numpy(),
+# and writable arrays still convert to it, so one signature covers both
+_f64_in = types.Array(types.float64, 1, 'A', readonly=True)
+
+
+# Explicit signature compiles eagerly at import; cache=True keeps the binary on disk
+@njit(types.float64[:](_f64_in, types.int64), cache=True, nogil=True)
+def move_mean(a, w):
+    """Rolling mean over window w, NaN unless all w points in the window are valid.
+
+    Matches ``Series.rolling(w).mean()`` (min_periods=w): NaNs are kept out of the
+    running sum, so a missing bar only blanks the windows that contain it.
+    """
+    out = np.empty(a.size, dtype=np.float64)
+    s = 0.0
+    count = 0
+    for i in range(a.size):
+        v = a[i]
+        if not np.isnan(v):
+            s += v
+            count += 1
+        if i >= w:
+            old = a[i - w]
+            if not np.isnan(old):
+                s -= old
+                count -= 1
+        out[i] = s / w if count == w else np.nan
+    return out